@@ -2,7 +2,14 @@
 Binance Wallet Manager - A package for managing Binance testnet wallet operations.
 """
 
+from .async_wallet_manager import AsyncBinanceWalletManager
+from .exceptions import WalletError, WalletNetworkError
 from .wallet_manager import BinanceWalletManager
 
-__all__ = ['BinanceWalletManager']
+__all__ = [
+    'AsyncBinanceWalletManager',
+    'BinanceWalletManager',
+    'WalletError',
+    'WalletNetworkError',
+]
 __version__ = '0.1.0'
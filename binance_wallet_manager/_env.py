@@ -0,0 +1,23 @@
+"""
+Environment loading helpers for Binance Wallet Manager.
+Makes sure the .env file is parsed at most once per process.
+"""
+
+from dotenv import load_dotenv
+
+_LOADED = False
+
+
+def ensure_env() -> None:
+    """
+    Load variables from the .env file into the environment, once.
+    
+    Later calls are no-ops. Variables already present in the environment
+    (e.g. exported by the shell or CI) are never overridden, but the rest of
+    the file is still applied.
+    """
+    global _LOADED
+    if _LOADED:
+        return
+    load_dotenv(override=False)
+    _LOADED = True
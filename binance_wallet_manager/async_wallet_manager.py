@@ -0,0 +1,448 @@
+"""
+Async Binance Wallet Manager - asyncio variant of the wallet operations.
+Mirrors BinanceWalletManager on top of ccxt.async_support so independent
+requests can run concurrently with asyncio.gather.
+"""
+
+import asyncio
+import copy
+import time
+
+import ccxt.async_support as ccxt_async
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from .config import Config, get_config
+from .exceptions import wallet_error
+from .wallet_manager import (
+    _build_params,
+    _coin_balance,
+    _deposit_address_result,
+    _markets_cache_path,
+    _read_markets_cache,
+    _withdrawal_result,
+    _write_markets_cache,
+)
+
+
+class AsyncBinanceWalletManager:
+    """
+    Manages Binance testnet wallet operations using asyncio.
+    
+    All requests share the exchange's single aiohttp session, so concurrent
+    calls reuse the same pooled keep-alive connections. Call ``close()`` (or
+    use the manager as an async context manager) when done.
+    
+    Example:
+        >>> async with AsyncBinanceWalletManager() as manager:
+        ...     balance, deposits = await asyncio.gather(
+        ...         manager.get_balance(),
+        ...         manager.get_deposit_history(limit=5),
+        ...     )
+    """
+    
+    def __init__(self, config: Optional[Config] = None):
+        """
+        Initialize the async Binance Wallet Manager.
+        
+        Args:
+            config: Optional Config object. If not provided, uses get_config().
+        
+        Raises:
+            ValueError: If configuration is invalid.
+        """
+        self.config = config or get_config()
+        
+        if not self.config.validate():
+            raise ValueError(
+                "Invalid configuration. Please set BINANCE_API_KEY and "
+                "BINANCE_API_SECRET environment variables."
+            )
+        
+        # Initialize async CCXT Binance exchange
+        self.exchange = ccxt_async.binance({
+            **self.config.api_credentials,
+            'enableRateLimit': True,
+            # Switch to testnet URLs while constructing, if configured
+            'sandbox': self.config.testnet,
+            'options': {
+                'defaultType': 'spot',  # spot, margin, future, delivery
+            }
+        })
+        
+        # Short-lived cache of fetch_balance() responses, see _fetch_balance()
+        self._balance_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._balance_ttl: float = self.config.balance_ttl
+        # In-flight fetch_balance() calls, shared by concurrent callers
+        self._pending_balance: Dict[str, asyncio.Future] = {}
+    
+    async def __aenter__(self) -> 'AsyncBinanceWalletManager':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP session."""
+        await self.exchange.close()
+    
+    async def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        """
+        Load exchange market metadata ahead of the first API call.
+        
+        Markets share the on-disk cache used by BinanceWalletManager.
+        
+        Args:
+            reload: Force a fresh download even if markets are already loaded.
+        
+        Returns:
+            Dictionary of markets keyed by symbol, or an empty dictionary if
+            they could not be loaded (CCXT will retry on the next call).
+        """
+        path = _markets_cache_path(self.config.testnet)
+        
+        if not reload and not self.exchange.markets:
+            cached = _read_markets_cache(path)
+            if cached is not None:
+                self.exchange.set_markets(cached['markets'], cached.get('currencies'))
+                return self.exchange.markets
+        
+        try:
+            markets = await self.exchange.load_markets(reload)
+        except ccxt_async.BaseError:
+            return {}
+        
+        _write_markets_cache(path, markets, self.exchange.currencies)
+        return markets
+    
+    async def _fetch_balance(self, nonzero_only: bool = False) -> Dict[str, Any]:
+        """
+        Fetch the balance, reusing a cached response while it is fresh.
+        
+        Concurrent callers are coalesced: while a request is in flight, other
+        callers await its result instead of issuing their own.
+        
+        A fresh full balance answers every query. Single-coin queries may
+        instead use a snapshot fetched with ``omitZeroBalances``, which leaves
+        out the hundreds of empty assets and is much smaller to download and
+        parse. A coin missing from that snapshot has a zero balance.
+        
+        Args:
+            nonzero_only: Accept a snapshot that omits zero balances.
+        
+        Returns:
+            Balance dictionary as returned by CCXT.
+        """
+        keys = ('full', 'nonzero') if nonzero_only else ('full',)
+        key = keys[-1]
+        
+        now = time.monotonic()
+        for cache_key in keys:
+            cached = self._balance_cache.get(cache_key)
+            if cached is not None and now - cached[0] < self._balance_ttl:
+                return cached[1]
+        
+        # Join a request already in flight rather than starting another
+        for cache_key in keys:
+            pending = self._pending_balance.get(cache_key)
+            if pending is not None:
+                return await asyncio.shield(pending)
+        
+        params = {'omitZeroBalances': True} if nonzero_only else {}
+        task = asyncio.ensure_future(self.exchange.fetch_balance(params))
+        self._pending_balance[key] = task
+        try:
+            balance = await asyncio.shield(task)
+        except BaseException:
+            if self._pending_balance.get(key) is task:
+                del self._pending_balance[key]
+            raise
+        
+        # Skip caching if the cache was invalidated while fetching
+        if self._pending_balance.get(key) is task:
+            del self._pending_balance[key]
+            self._balance_cache[key] = (time.monotonic(), balance)
+        return balance
+    
+    async def get_balance(self, coin: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get wallet balance for a specific coin or all coins.
+        
+        Args:
+            coin: Optional coin symbol (e.g., 'BTC', 'USDT'). If None, returns all balances.
+        
+        Returns:
+            Dictionary containing balance information. Each call returns a
+            new dictionary, which the caller may modify freely.
+        
+        Raises:
+            WalletError: If balance retrieval fails.
+        """
+        try:
+            balance = await self._fetch_balance(nonzero_only=bool(coin))
+            
+            if coin:
+                return _coin_balance(balance, coin)
+            
+            # Hand out a copy so callers cannot alter the cached response
+            return copy.deepcopy(balance)
+        except ccxt_async.BaseError as e:
+            raise wallet_error("Failed to fetch balance", e) from e
+    
+    async def withdraw(
+        self,
+        coin: str,
+        amount: float,
+        address: str,
+        network: Optional[str] = None,
+        tag: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Withdraw cryptocurrency to a specific address and network.
+        
+        Args:
+            coin: Coin symbol to withdraw (e.g., 'BTC', 'USDT', 'ETH').
+            amount: Amount to withdraw.
+            address: Destination wallet address.
+            network: Optional network specification (e.g., 'ERC20', 'TRC20', 'BEP20').
+            tag: Optional address tag/memo for certain coins (e.g., XRP, XLM).
+            **kwargs: Additional parameters to pass to the exchange.
+        
+        Returns:
+            Dictionary containing withdrawal information including transaction ID.
+        
+        Raises:
+            WalletError: If withdrawal fails. A timeout raises plain
+                WalletError rather than WalletNetworkError, since the
+                withdrawal may still have been executed; check the
+                withdrawal history before retrying.
+        """
+        try:
+            params = _build_params(network, tag, kwargs)
+            
+            # Perform withdrawal
+            result = await self.exchange.withdraw(
+                code=coin,
+                amount=amount,
+                address=address,
+                tag=tag,
+                params=params
+            )
+            
+            return _withdrawal_result(result, coin, amount, address, network)
+        except ccxt_async.BaseError as e:
+            # A timed-out withdrawal may still have been executed
+            raise wallet_error("Withdrawal failed", e, idempotent=False) from e
+        finally:
+            # Funds may have moved even if the call failed, so the cached
+            # balance is stale either way
+            self._balance_cache.clear()
+            self._pending_balance.clear()
+    
+    async def get_deposit_address(
+        self,
+        coin: str,
+        network: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Get deposit address for a specific coin and network.
+        
+        Args:
+            coin: Coin symbol (e.g., 'BTC', 'USDT', 'ETH').
+            network: Optional network specification (e.g., 'ERC20', 'TRC20', 'BEP20').
+            **kwargs: Additional parameters to pass to the exchange.
+        
+        Returns:
+            Dictionary containing deposit address information.
+        
+        Raises:
+            WalletError: If fetching deposit address fails.
+        """
+        try:
+            params = _build_params(network, extra=kwargs)
+            
+            # Fetch deposit address
+            result = await self.exchange.fetch_deposit_address(
+                code=coin,
+                params=params
+            )
+            
+            return _deposit_address_result(result, coin, network)
+        except ccxt_async.BaseError as e:
+            raise wallet_error("Failed to fetch deposit address", e) from e
+    
+    async def _iter_transactions(
+        self,
+        fetch: Callable[..., Awaitable[list]],
+        coin: Optional[str],
+        since: Optional[int],
+        page_size: int,
+        params: Dict[str, Any],
+        error_message: str,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield transactions page by page from a CCXT history method.
+        
+        Args:
+            fetch: CCXT coroutine to call (fetch_deposits or fetch_withdrawals).
+            coin: Optional coin symbol.
+            since: Optional timestamp to fetch transactions since (in milliseconds).
+            page_size: Number of transactions to request per page.
+            params: Additional parameters to pass to the exchange.
+            error_message: Message for the error raised if a page fails.
+        
+        Yields:
+            Transaction dictionaries.
+        """
+        offset = 0
+        while True:
+            try:
+                page = await fetch(
+                    code=coin,
+                    since=since,
+                    limit=page_size,
+                    params={**params, 'offset': offset}
+                )
+            except ccxt_async.BaseError as e:
+                raise wallet_error(error_message, e) from e
+            
+            for transaction in page:
+                yield transaction
+            
+            if len(page) < page_size:
+                return
+            offset += page_size
+    
+    async def get_deposit_history(
+        self,
+        coin: Optional[str] = None,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        **kwargs
+    ) -> list:
+        """
+        Get deposit history for specific coin or all deposits.
+        
+        Args:
+            coin: Optional coin symbol. If None, returns all deposits.
+            since: Optional timestamp to fetch deposits since (in milliseconds).
+            limit: Optional limit on number of results.
+            **kwargs: Additional parameters to pass to the exchange.
+        
+        Returns:
+            List of deposit transactions.
+        
+        Raises:
+            WalletError: If fetching deposit history fails.
+        """
+        try:
+            params = _build_params(extra=kwargs)
+            
+            deposits = await self.exchange.fetch_deposits(
+                code=coin,
+                since=since,
+                limit=limit,
+                params=params
+            )
+            
+            return deposits
+        except ccxt_async.BaseError as e:
+            raise wallet_error("Failed to fetch deposit history", e) from e
+    
+    def iter_deposit_history(
+        self,
+        coin: Optional[str] = None,
+        since: Optional[int] = None,
+        page_size: int = 100,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over deposit history, fetching one page at a time.
+        
+        Args:
+            coin: Optional coin symbol. If None, iterates over all deposits.
+            since: Optional timestamp to fetch deposits since (in milliseconds).
+            page_size: Number of deposits to request per page.
+            **kwargs: Additional parameters to pass to the exchange.
+        
+        Yields:
+            Deposit transactions.
+        
+        Raises:
+            WalletError: If fetching a page of deposit history fails.
+        """
+        return self._iter_transactions(
+            self.exchange.fetch_deposits,
+            coin,
+            since,
+            page_size,
+            _build_params(extra=kwargs),
+            "Failed to fetch deposit history",
+        )
+    
+    async def get_withdrawal_history(
+        self,
+        coin: Optional[str] = None,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        **kwargs
+    ) -> list:
+        """
+        Get withdrawal history for specific coin or all withdrawals.
+        
+        Args:
+            coin: Optional coin symbol. If None, returns all withdrawals.
+            since: Optional timestamp to fetch withdrawals since (in milliseconds).
+            limit: Optional limit on number of results.
+            **kwargs: Additional parameters to pass to the exchange.
+        
+        Returns:
+            List of withdrawal transactions.
+        
+        Raises:
+            WalletError: If fetching withdrawal history fails.
+        """
+        try:
+            params = _build_params(extra=kwargs)
+            
+            withdrawals = await self.exchange.fetch_withdrawals(
+                code=coin,
+                since=since,
+                limit=limit,
+                params=params
+            )
+            
+            return withdrawals
+        except ccxt_async.BaseError as e:
+            raise wallet_error("Failed to fetch withdrawal history", e) from e
+    
+    def iter_withdrawal_history(
+        self,
+        coin: Optional[str] = None,
+        since: Optional[int] = None,
+        page_size: int = 100,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over withdrawal history, fetching one page at a time.
+        
+        Args:
+            coin: Optional coin symbol. If None, iterates over all withdrawals.
+            since: Optional timestamp to fetch withdrawals since (in milliseconds).
+            page_size: Number of withdrawals to request per page.
+            **kwargs: Additional parameters to pass to the exchange.
+        
+        Yields:
+            Withdrawal transactions.
+        
+        Raises:
+            WalletError: If fetching a page of withdrawal history fails.
+        """
+        return self._iter_transactions(
+            self.exchange.fetch_withdrawals,
+            coin,
+            since,
+            page_size,
+            _build_params(extra=kwargs),
+            "Failed to fetch withdrawal history",
+        )
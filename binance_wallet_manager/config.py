@@ -3,23 +3,53 @@ Configuration module for Binance Wallet Manager.
 Handles environment variables and API credentials.
 """
 
+import functools
 import os
-from typing import Optional
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional
+from ._env import ensure_env
 
 # Load environment variables from .env file
-load_dotenv()
+ensure_env()
 
 
+def _env_flag(name: str, default: str = 'true') -> bool:
+    """Read a boolean flag from the environment."""
+    return os.getenv(name, default).lower() == 'true'
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Configuration class for Binance API credentials and settings."""
+    """
+    Configuration class for Binance API credentials and settings.
+    
+    Every field defaults to its environment variable, so ``Config()`` reads the
+    current environment. Use get_config() to share one parsed instance.
+    """
+    
+    # Credentials are kept out of repr() so tracebacks and test output stay clean
+    api_key: Optional[str] = field(
+        default_factory=lambda: os.getenv('BINANCE_API_KEY'), repr=False
+    )
+    api_secret: Optional[str] = field(
+        default_factory=lambda: os.getenv('BINANCE_API_SECRET'), repr=False
+    )
+    testnet: bool = field(default_factory=lambda: _env_flag('BINANCE_TESTNET'))
+    sandbox_mode: bool = field(default_factory=lambda: _env_flag('BINANCE_SANDBOX'))
+    balance_ttl: float = field(
+        default_factory=lambda: float(os.getenv('BINANCE_BALANCE_TTL', '2'))
+    )
+    _api_credentials: Mapping[str, Optional[str]] = field(
+        init=False, repr=False, compare=False
+    )
     
-    def __init__(self):
-        """Initialize configuration from environment variables."""
-        self.api_key: Optional[str] = os.getenv('BINANCE_API_KEY')
-        self.api_secret: Optional[str] = os.getenv('BINANCE_API_SECRET')
-        self.testnet: bool = os.getenv('BINANCE_TESTNET', 'true').lower() == 'true'
-        self.sandbox_mode: bool = os.getenv('BINANCE_SANDBOX', 'true').lower() == 'true'
+    def __post_init__(self):
+        """Build the read-only credentials mapping once per instance."""
+        object.__setattr__(self, '_api_credentials', MappingProxyType({
+            'apiKey': self.api_key,
+            'secret': self.api_secret,
+        }))
     
     def validate(self) -> bool:
         """
@@ -32,14 +62,33 @@ class Config:
             return False
         return True
     
+    @property
+    def api_credentials(self) -> Mapping[str, Optional[str]]:
+        """
+        API credentials in CCXT's constructor format.
+        
+        Returns:
+            Mapping: Read-only mapping with the API key and secret, shared by
+            every access.
+        """
+        return self._api_credentials
+    
     def get_api_credentials(self) -> dict:
         """
         Get API credentials as a dictionary.
         
         Returns:
-            dict: Dictionary containing API key and secret.
+            dict: Mutable copy of api_credentials containing API key and secret.
         """
-        return {
-            'apiKey': self.api_key,
-            'secret': self.api_secret,
-        }
+        return dict(self._api_credentials)
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Get the process-wide configuration, parsed from the environment once.
+    
+    Returns:
+        Cached Config instance.
+    """
+    return Config()
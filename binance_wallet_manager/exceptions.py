@@ -0,0 +1,36 @@
+"""
+Exceptions raised by Binance Wallet Manager.
+The original CCXT error is always chained as ``__cause__``.
+"""
+
+import ccxt
+
+
+class WalletError(Exception):
+    """Raised when a wallet operation fails on the exchange side."""
+
+
+class WalletNetworkError(WalletError):
+    """Raised when a wallet operation fails for a transient network reason."""
+
+
+def wallet_error(message: str, error: ccxt.BaseError, idempotent: bool = True) -> WalletError:
+    """
+    Build the wallet exception matching a CCXT error.
+    
+    Args:
+        message: Description of the failed operation.
+        error: Original CCXT exception.
+        idempotent: False for requests that move funds, such as withdrawals.
+            A timeout may then have reached the exchange, so it is not
+            reported as a retryable network error.
+    
+    Returns:
+        WalletNetworkError for network errors (including rate limits),
+        otherwise WalletError. Raise it ``from error`` to keep the cause.
+    """
+    if not idempotent and isinstance(error, ccxt.RequestTimeout):
+        return WalletError(message)
+    if isinstance(error, ccxt.NetworkError):
+        return WalletNetworkError(message)
+    return WalletError(message)
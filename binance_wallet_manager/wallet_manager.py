@@ -3,9 +3,191 @@ Binance Wallet Manager - Main module for wallet operations.
 Provides withdraw and deposit functionality for Binance testnet.
 """
 
+import copy
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+
 import ccxt
-from typing import Dict, Optional, Any
-from .config import Config
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib3.util.retry import Retry
+from .config import Config, get_config
+from .exceptions import wallet_error
+
+
+# How long market metadata cached on disk stays valid, in seconds
+_MARKETS_CACHE_TTL = 6 * 60 * 60
+
+
+def _markets_cache_path(testnet: bool) -> str:
+    """Return the on-disk markets cache file for the live or testnet API."""
+    cache_home = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    name = 'markets-testnet.json' if testnet else 'markets.json'
+    return os.path.join(cache_home, 'binance_wallet_manager', name)
+
+
+def _read_markets_cache(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read cached market metadata if the file exists and is still fresh.
+    
+    Args:
+        path: Cache file path.
+    
+    Returns:
+        Dictionary with 'markets' and 'currencies', or None if the cache is
+        missing, expired or unreadable.
+    """
+    try:
+        if time.time() - os.path.getmtime(path) >= _MARKETS_CACHE_TTL:
+            return None
+        with open(path, encoding='utf-8') as fh:
+            cached = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or not cached.get('markets'):
+        return None
+    return cached
+
+
+def _write_markets_cache(path: str, markets: Dict[str, Any], currencies: Dict[str, Any]) -> None:
+    """
+    Write market metadata to the cache file atomically.
+    
+    Failures are ignored; the cache is only an optimization.
+    
+    Args:
+        path: Cache file path.
+        markets: Markets keyed by symbol.
+        currencies: Currencies keyed by code.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump({'markets': markets, 'currencies': currencies}, fh)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _build_session() -> requests.Session:
+    """
+    Build the HTTP session used by the CCXT client.
+    
+    Connections are kept alive and pooled so repeated API calls reuse the
+    same TLS connection. Only failed connection attempts and transient 5xx
+    responses to idempotent requests are retried; withdrawals (POST) are
+    never retried. Rate-limit (429/418) responses are passed straight to
+    CCXT, which maps them to DDoSProtection, since retrying them is what
+    Binance escalates into IP bans. Read timeouts are not retried either,
+    so the exchange timeout stays the upper bound for a call.
+    
+    Returns:
+        Configured requests.Session.
+    """
+    session = requests.Session()
+    # Match CCXT's own session, which ignores proxy settings from the environment
+    session.trust_env = False
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        other=0,
+        backoff_factor=0.2,
+        status_forcelist=[500, 502, 503, 504],
+        # Hand the final response to CCXT so it can map the exchange error
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=40,
+        max_retries=retry,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+def _build_params(
+    network: Optional[str] = None,
+    tag: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the exchange params dict for a wallet request.
+    
+    Args:
+        network: Optional network specification (e.g., 'ERC20').
+        tag: Optional address tag/memo.
+        extra: Additional caller parameters; these take precedence.
+    
+    Returns:
+        New params dictionary.
+    """
+    params = {}
+    if network:
+        params['network'] = network
+    if tag:
+        params['tag'] = tag
+    if extra:
+        params.update(extra)
+    return params
+
+
+def _coin_balance(balance: Dict[str, Any], coin: str) -> Dict[str, Any]:
+    """Extract the free/used/total amounts of one coin from a full balance."""
+    if coin in balance['total']:
+        return {
+            coin: {
+                'free': balance['free'].get(coin, 0),
+                'used': balance['used'].get(coin, 0),
+                'total': balance['total'].get(coin, 0),
+            }
+        }
+    return {coin: {'free': 0, 'used': 0, 'total': 0}}
+
+
+def _withdrawal_result(
+    result: Dict[str, Any],
+    coin: str,
+    amount: float,
+    address: str,
+    network: Optional[str],
+) -> Dict[str, Any]:
+    """Build the withdraw() response from the raw CCXT transaction."""
+    return {
+        'success': True,
+        'transaction_id': result.get('id'),
+        'coin': coin,
+        'amount': amount,
+        'address': address,
+        'network': network,
+        'info': result
+    }
+
+
+def _deposit_address_result(
+    result: Dict[str, Any],
+    coin: str,
+    network: Optional[str],
+) -> Dict[str, Any]:
+    """Build the get_deposit_address() response from the raw CCXT result."""
+    return {
+        'success': True,
+        'coin': coin,
+        'address': result.get('address'),
+        'tag': result.get('tag'),
+        'network': network,
+        'info': result
+    }
 
 
 class BinanceWalletManager:
@@ -14,17 +196,21 @@ class BinanceWalletManager:
     Uses CCXT library for exchange interactions.
     """
     
+    # Shared managers keyed by (api_key, testnet), see get_shared()
+    _instances: Dict[Tuple[Optional[str], bool], 'BinanceWalletManager'] = {}
+    _instances_lock = threading.Lock()
+    
     def __init__(self, config: Optional[Config] = None):
         """
         Initialize the Binance Wallet Manager.
         
         Args:
-            config: Optional Config object. If not provided, creates a new Config.
+            config: Optional Config object. If not provided, uses get_config().
         
         Raises:
             ValueError: If configuration is invalid.
         """
-        self.config = config or Config()
+        self.config = config or get_config()
         
         if not self.config.validate():
             raise ValueError(
@@ -34,49 +220,180 @@ class BinanceWalletManager:
         
         # Initialize CCXT Binance exchange
         self.exchange = ccxt.binance({
-            'apiKey': self.config.api_key,
-            'secret': self.config.api_secret,
+            **self.config.api_credentials,
             'enableRateLimit': True,
+            # Switch to testnet URLs while constructing, if configured
+            'sandbox': self.config.testnet,
+            'session': _build_session(),
+            'headers': {'Connection': 'keep-alive'},
             'options': {
                 'defaultType': 'spot',  # spot, margin, future, delivery
             }
         })
         
-        # Set testnet mode if configured
-        if self.config.testnet:
-            self.exchange.set_sandbox_mode(True)
+        # Short-lived cache of fetch_balance() responses, see _fetch_balance()
+        self._balance_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._balance_ttl: float = self.config.balance_ttl
+        self._balance_lock = threading.Lock()
+        # In-flight fetch_balance() calls, shared by concurrent callers
+        self._pending_balance: Dict[str, Future] = {}
+    
+    @classmethod
+    def get_shared(cls, config: Optional[Config] = None) -> 'BinanceWalletManager':
+        """
+        Get a wallet manager shared by all callers using the same credentials.
+        
+        The CCXT client is created, and its markets loaded, only once per
+        ``(api_key, testnet)`` pair, so later callers skip the connection
+        setup and market download.
+        
+        Args:
+            config: Optional Config object. If not provided, uses get_config().
+        
+        Returns:
+            The shared BinanceWalletManager for the given credentials.
+        
+        Raises:
+            ValueError: If configuration is invalid.
+        """
+        config = config or get_config()
+        key = (config.api_key, config.testnet)
+        
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            if manager is None:
+                manager = cls(config)
+                manager.load_markets()
+                cls._instances[key] = manager
+        
+        return manager
+    
+    def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        """
+        Load exchange market metadata ahead of the first API call.
+        
+        CCXT otherwise loads markets implicitly on the first request that
+        needs them, adding that download to the first call's latency.
+        Downloaded markets are cached on disk (under ``$XDG_CACHE_HOME`` or
+        ``~/.cache``) for six hours, so new processes skip the download.
+        
+        Args:
+            reload: Force a fresh download even if markets are already loaded.
+        
+        Returns:
+            Dictionary of markets keyed by symbol, or an empty dictionary if
+            they could not be loaded (CCXT will retry on the next call).
+        """
+        path = _markets_cache_path(self.config.testnet)
+        
+        if not reload and not self.exchange.markets:
+            cached = _read_markets_cache(path)
+            if cached is not None:
+                self.exchange.set_markets(cached['markets'], cached.get('currencies'))
+                return self.exchange.markets
+        
+        try:
+            markets = self.exchange.load_markets(reload)
+        except ccxt.BaseError:
+            return {}
+        
+        _write_markets_cache(path, markets, self.exchange.currencies)
+        return markets
+    
+    def _fetch_balance(self, nonzero_only: bool = False) -> Dict[str, Any]:
+        """
+        Fetch the balance, reusing a cached response while it is fresh.
+        
+        Concurrent callers are coalesced: while a request is in flight, other
+        callers wait for its result instead of issuing their own.
+        
+        A fresh full balance answers every query. Single-coin queries may
+        instead use a snapshot fetched with ``omitZeroBalances``, which leaves
+        out the hundreds of empty assets and is much smaller to download and
+        parse. A coin missing from that snapshot has a zero balance.
+        
+        Args:
+            nonzero_only: Accept a snapshot that omits zero balances.
+        
+        Returns:
+            Balance dictionary as returned by CCXT.
+        """
+        keys = ('full', 'nonzero') if nonzero_only else ('full',)
+        key = keys[-1]
+        
+        with self._balance_lock:
+            now = time.monotonic()
+            for cache_key in keys:
+                cached = self._balance_cache.get(cache_key)
+                if cached is not None and now - cached[0] < self._balance_ttl:
+                    return cached[1]
+            
+            # Join a request already in flight rather than starting another
+            for cache_key in keys:
+                pending = self._pending_balance.get(cache_key)
+                if pending is not None:
+                    break
+            else:
+                pending = None
+                future: Future = Future()
+                self._pending_balance[key] = future
+        
+        if pending is not None:
+            return pending.result()
+        
+        params = {'omitZeroBalances': True} if nonzero_only else {}
+        try:
+            balance = self.exchange.fetch_balance(params)
+        except BaseException as e:
+            with self._balance_lock:
+                if self._pending_balance.get(key) is future:
+                    del self._pending_balance[key]
+            future.set_exception(e)
+            raise
+        
+        with self._balance_lock:
+            # Skip caching if the cache was invalidated while fetching
+            if self._pending_balance.get(key) is future:
+                del self._pending_balance[key]
+                self._balance_cache[key] = (time.monotonic(), balance)
+        future.set_result(balance)
+        return balance
+    
+    def _invalidate_balance_cache(self) -> None:
+        """Drop the cached balance so the next query hits the exchange."""
+        with self._balance_lock:
+            self._balance_cache.clear()
+            self._pending_balance.clear()
     
     def get_balance(self, coin: Optional[str] = None) -> Dict[str, Any]:
         """
         Get wallet balance for a specific coin or all coins.
         
+        Responses are cached for ``Config.balance_ttl`` seconds, so a follow-up
+        query for a single coin is answered from the previous full balance.
+        Without a fresh full balance, a single-coin query only downloads the
+        non-zero balances.
+        
         Args:
             coin: Optional coin symbol (e.g., 'BTC', 'USDT'). If None, returns all balances.
         
         Returns:
-            Dictionary containing balance information.
+            Dictionary containing balance information. Each call returns a
+            new dictionary, which the caller may modify freely.
         
         Raises:
-            Exception: If balance retrieval fails.
+            WalletError: If balance retrieval fails.
         """
         try:
-            balance = self.exchange.fetch_balance()
+            balance = self._fetch_balance(nonzero_only=bool(coin))
             
             if coin:
-                if coin in balance['total']:
-                    return {
-                        coin: {
-                            'free': balance['free'].get(coin, 0),
-                            'used': balance['used'].get(coin, 0),
-                            'total': balance['total'].get(coin, 0),
-                        }
-                    }
-                else:
-                    return {coin: {'free': 0, 'used': 0, 'total': 0}}
+                return _coin_balance(balance, coin)
             
-            return balance
-        except Exception as e:
-            raise Exception(f"Failed to fetch balance: {str(e)}")
+            # Hand out a copy so callers cannot alter the cached response
+            return copy.deepcopy(balance)
+        except ccxt.BaseError as e:
+            raise wallet_error("Failed to fetch balance", e) from e
     
     def withdraw(
         self,
@@ -102,7 +419,10 @@ class BinanceWalletManager:
             Dictionary containing withdrawal information including transaction ID.
         
         Raises:
-            Exception: If withdrawal fails.
+            WalletError: If withdrawal fails. A timeout raises plain
+                WalletError rather than WalletNetworkError, since the
+                withdrawal may still have been executed; check the
+                withdrawal history before retrying.
         
         Example:
             >>> manager = BinanceWalletManager()
@@ -114,18 +434,7 @@ class BinanceWalletManager:
             ... )
         """
         try:
-            params = {}
-            
-            # Add network parameter if specified
-            if network:
-                params['network'] = network
-            
-            # Add tag/memo if specified
-            if tag:
-                params['tag'] = tag
-            
-            # Merge additional kwargs
-            params.update(kwargs)
+            params = _build_params(network, tag, kwargs)
             
             # Perform withdrawal
             result = self.exchange.withdraw(
@@ -136,17 +445,14 @@ class BinanceWalletManager:
                 params=params
             )
             
-            return {
-                'success': True,
-                'transaction_id': result.get('id'),
-                'coin': coin,
-                'amount': amount,
-                'address': address,
-                'network': network,
-                'info': result
-            }
-        except Exception as e:
-            raise Exception(f"Withdrawal failed: {str(e)}")
+            return _withdrawal_result(result, coin, amount, address, network)
+        except ccxt.BaseError as e:
+            # A timed-out withdrawal may still have been executed
+            raise wallet_error("Withdrawal failed", e, idempotent=False) from e
+        finally:
+            # Funds may have moved even if the call failed, so the cached
+            # balance is stale either way
+            self._invalidate_balance_cache()
     
     def get_deposit_address(
         self,
@@ -166,7 +472,7 @@ class BinanceWalletManager:
             Dictionary containing deposit address information.
         
         Raises:
-            Exception: If fetching deposit address fails.
+            WalletError: If fetching deposit address fails.
         
         Example:
             >>> manager = BinanceWalletManager()
@@ -174,14 +480,7 @@ class BinanceWalletManager:
             >>> print(result['address'])
         """
         try:
-            params = {}
-            
-            # Add network parameter if specified
-            if network:
-                params['network'] = network
-            
-            # Merge additional kwargs
-            params.update(kwargs)
+            params = _build_params(network, extra=kwargs)
             
             # Fetch deposit address
             result = self.exchange.fetch_deposit_address(
@@ -189,16 +488,54 @@ class BinanceWalletManager:
                 params=params
             )
             
-            return {
-                'success': True,
-                'coin': coin,
-                'address': result.get('address'),
-                'tag': result.get('tag'),
-                'network': network,
-                'info': result
-            }
-        except Exception as e:
-            raise Exception(f"Failed to fetch deposit address: {str(e)}")
+            return _deposit_address_result(result, coin, network)
+        except ccxt.BaseError as e:
+            raise wallet_error("Failed to fetch deposit address", e) from e
+    
+    def _iter_transactions(
+        self,
+        fetch: Callable[..., list],
+        coin: Optional[str],
+        since: Optional[int],
+        page_size: int,
+        params: Dict[str, Any],
+        error_message: str,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield transactions page by page from a CCXT history method.
+        
+        Pages are requested with Binance's ``offset`` parameter, so only one
+        page is held in memory and no request is made until the caller asks
+        for more items. Iteration stops at the first short page.
+        
+        Args:
+            fetch: CCXT method to call (fetch_deposits or fetch_withdrawals).
+            coin: Optional coin symbol.
+            since: Optional timestamp to fetch transactions since (in milliseconds).
+            page_size: Number of transactions to request per page.
+            params: Additional parameters to pass to the exchange.
+            error_message: Message for the error raised if a page fails.
+        
+        Yields:
+            Transaction dictionaries.
+        """
+        offset = 0
+        while True:
+            try:
+                page = fetch(
+                    code=coin,
+                    since=since,
+                    limit=page_size,
+                    params={**params, 'offset': offset}
+                )
+            except ccxt.BaseError as e:
+                raise wallet_error(error_message, e) from e
+            
+            yield from page
+            
+            if len(page) < page_size:
+                return
+            offset += page_size
     
     def get_deposit_history(
         self,
@@ -220,14 +557,14 @@ class BinanceWalletManager:
             List of deposit transactions.
         
         Raises:
-            Exception: If fetching deposit history fails.
+            WalletError: If fetching deposit history fails.
         
         Example:
             >>> manager = BinanceWalletManager()
             >>> deposits = manager.get_deposit_history(coin='USDT', limit=10)
         """
         try:
-            params = kwargs
+            params = _build_params(extra=kwargs)
             
             deposits = self.exchange.fetch_deposits(
                 code=coin,
@@ -237,8 +574,43 @@ class BinanceWalletManager:
             )
             
             return deposits
-        except Exception as e:
-            raise Exception(f"Failed to fetch deposit history: {str(e)}")
+        except ccxt.BaseError as e:
+            raise wallet_error("Failed to fetch deposit history", e) from e
+    
+    def iter_deposit_history(
+        self,
+        coin: Optional[str] = None,
+        since: Optional[int] = None,
+        page_size: int = 100,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over deposit history, fetching one page at a time.
+        
+        Args:
+            coin: Optional coin symbol. If None, iterates over all deposits.
+            since: Optional timestamp to fetch deposits since (in milliseconds).
+            page_size: Number of deposits to request per page.
+            **kwargs: Additional parameters to pass to the exchange.
+        
+        Yields:
+            Deposit transactions.
+        
+        Raises:
+            WalletError: If fetching a page of deposit history fails.
+        
+        Example:
+            >>> manager = BinanceWalletManager()
+            >>> recent = list(itertools.islice(manager.iter_deposit_history(), 3))
+        """
+        return self._iter_transactions(
+            self.exchange.fetch_deposits,
+            coin,
+            since,
+            page_size,
+            _build_params(extra=kwargs),
+            "Failed to fetch deposit history",
+        )
     
     def get_withdrawal_history(
         self,
@@ -260,14 +632,14 @@ class BinanceWalletManager:
             List of withdrawal transactions.
         
         Raises:
-            Exception: If fetching withdrawal history fails.
+            WalletError: If fetching withdrawal history fails.
         
         Example:
             >>> manager = BinanceWalletManager()
             >>> withdrawals = manager.get_withdrawal_history(coin='BTC', limit=5)
         """
         try:
-            params = kwargs
+            params = _build_params(extra=kwargs)
             
             withdrawals = self.exchange.fetch_withdrawals(
                 code=coin,
@@ -277,5 +649,40 @@ class BinanceWalletManager:
             )
             
             return withdrawals
-        except Exception as e:
-            raise Exception(f"Failed to fetch withdrawal history: {str(e)}")
+        except ccxt.BaseError as e:
+            raise wallet_error("Failed to fetch withdrawal history", e) from e
+    
+    def iter_withdrawal_history(
+        self,
+        coin: Optional[str] = None,
+        since: Optional[int] = None,
+        page_size: int = 100,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over withdrawal history, fetching one page at a time.
+        
+        Args:
+            coin: Optional coin symbol. If None, iterates over all withdrawals.
+            since: Optional timestamp to fetch withdrawals since (in milliseconds).
+            page_size: Number of withdrawals to request per page.
+            **kwargs: Additional parameters to pass to the exchange.
+        
+        Yields:
+            Withdrawal transactions.
+        
+        Raises:
+            WalletError: If fetching a page of withdrawal history fails.
+        
+        Example:
+            >>> manager = BinanceWalletManager()
+            >>> recent = list(itertools.islice(manager.iter_withdrawal_history(), 3))
+        """
+        return self._iter_transactions(
+            self.exchange.fetch_withdrawals,
+            coin,
+            since,
+            page_size,
+            _build_params(extra=kwargs),
+            "Failed to fetch withdrawal history",
+        )
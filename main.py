@@ -3,8 +3,134 @@ Example usage of Binance Wallet Manager.
 This script demonstrates the main features of the wallet manager.
 """
 
-from binance_wallet_manager import BinanceWalletManager
-from binance_wallet_manager.config import Config
+import asyncio
+import contextlib
+import sys
+
+from binance_wallet_manager import AsyncBinanceWalletManager
+from binance_wallet_manager.config import Config, get_config
+
+
+def describe_error(error: Exception) -> str:
+    """Format an error together with the exchange error that caused it."""
+    if error.__cause__ is not None:
+        return f"{error} ({error.__cause__})"
+    return str(error)
+
+
+async def take(iterator, count: int) -> list:
+    """Collect at most ``count`` items from an async iterator, then close it."""
+    items = []
+    async with contextlib.aclosing(iterator) as items_iter:
+        async for item in items_iter:
+            items.append(item)
+            if len(items) >= count:
+                break
+    return items
+
+
+def flush(out: list) -> None:
+    """Write the buffered lines of one section to stdout in a single call."""
+    sys.stdout.write('\n'.join(out) + '\n')
+    sys.stdout.flush()
+    out.clear()
+
+
+async def demo(config: Config):
+    """Run the examples, fetching independent data concurrently."""
+    out = []
+    p = out.append
+    
+    # Initialize wallet manager
+    print("✓ Initializing Binance Wallet Manager...")
+    async with AsyncBinanceWalletManager(config) as manager:
+        # Load markets once (from the disk cache when fresh) before the
+        # concurrent calls, which would otherwise each trigger a download
+        await manager.load_markets()
+        p(f"✓ Connected to Binance {'(Testnet)' if config.testnet else '(Live)'}")
+        p("")
+        
+        # The four queries are independent, so run them concurrently
+        p("Fetching balances, deposit address and history concurrently...")
+        p("")
+        flush(out)
+        balance, deposit_info, deposits, withdrawals = await asyncio.gather(
+            manager.get_balance(),
+            manager.get_deposit_address(coin='USDT', network='ERC20'),
+            take(manager.iter_deposit_history(page_size=3), 3),
+            take(manager.iter_withdrawal_history(page_size=3), 3),
+            return_exceptions=True,
+        )
+    
+    # Example 1: Get Balance
+    p("--- Example 1: Get Balance ---")
+    if isinstance(balance, Exception):
+        p(f"✗ Error getting balance: {describe_error(balance)}")
+    else:
+        p("✓ Balance retrieved successfully")
+        
+        # Display balances with non-zero amounts
+        p("\nNon-zero balances:")
+        for coin, amount in balance['total'].items():
+            if amount > 0:
+                p(f"  {coin}: {amount}")
+    p("")
+    flush(out)
+    
+    # Example 2: Get Deposit Address
+    p("--- Example 2: Get Deposit Address ---")
+    p("USDT deposit address (ERC20 network):")
+    if isinstance(deposit_info, Exception):
+        p(f"✗ Error getting deposit address: {describe_error(deposit_info)}")
+    else:
+        p(f"✓ Deposit address: {deposit_info['address']}")
+        if deposit_info.get('tag'):
+            p(f"  Tag/Memo: {deposit_info['tag']}")
+    p("")
+    flush(out)
+    
+    # Example 3: Withdraw (commented out for safety)
+    p("--- Example 3: Withdraw (Demo) ---")
+    p("Withdraw function is available but commented out for safety.")
+    p("Example usage:")
+    p("""
+    result = await manager.withdraw(
+        coin='USDT',
+        amount=10.0,
+        address='0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb',
+        network='ERC20'
+    )
+    print(f"✓ Withdrawal successful! TX ID: {result['transaction_id']}")
+    """)
+    p("")
+    flush(out)
+    
+    # Example 4: Get Deposit History
+    p("--- Example 4: Get Deposit History ---")
+    if isinstance(deposits, Exception):
+        p(f"✗ Error getting deposit history: {describe_error(deposits)}")
+    else:
+        p(f"✓ Showing {len(deposits)} deposit(s)")
+        for i, deposit in enumerate(deposits, 1):
+            p(f"  {i}. {deposit.get('currency', 'N/A')} - "
+              f"Amount: {deposit.get('amount', 0)} - "
+              f"Status: {deposit.get('status', 'N/A')}")
+    p("")
+    flush(out)
+    
+    # Example 5: Get Withdrawal History
+    p("--- Example 5: Get Withdrawal History ---")
+    if isinstance(withdrawals, Exception):
+        p(f"✗ Error getting withdrawal history: {describe_error(withdrawals)}")
+    else:
+        p(f"✓ Showing {len(withdrawals)} withdrawal(s)")
+        for i, withdrawal in enumerate(withdrawals, 1):
+            p(f"  {i}. {withdrawal.get('currency', 'N/A')} - "
+              f"Amount: {withdrawal.get('amount', 0)} - "
+              f"Status: {withdrawal.get('status', 'N/A')}")
+    p("")
+    p("=== Demo Complete ===")
+    flush(out)
 
 
 def main():
@@ -13,7 +139,7 @@ def main():
     
     try:
         # Initialize configuration
-        config = Config()
+        config = get_config()
         
         # Check if configuration is valid
         if not config.validate():
@@ -23,85 +149,8 @@ def main():
             print("\nGet your testnet API keys from: https://testnet.binance.vision/")
             return
         
-        # Initialize wallet manager
-        print("✓ Initializing Binance Wallet Manager...")
-        manager = BinanceWalletManager(config)
-        print("✓ Connected to Binance", "(Testnet)" if config.testnet else "(Live)")
-        print()
-        
-        # Example 1: Get Balance
-        print("--- Example 1: Get Balance ---")
-        print("Fetching wallet balances...")
-        try:
-            balance = manager.get_balance()
-            print(f"✓ Balance retrieved successfully")
-            
-            # Display balances with non-zero amounts
-            print("\nNon-zero balances:")
-            for coin, amount in balance['total'].items():
-                if amount > 0:
-                    print(f"  {coin}: {amount}")
-        except Exception as e:
-            print(f"✗ Error getting balance: {e}")
-        print()
-        
-        # Example 2: Get Deposit Address
-        print("--- Example 2: Get Deposit Address ---")
-        print("Getting USDT deposit address (ERC20 network)...")
-        try:
-            deposit_info = manager.get_deposit_address(coin='USDT', network='ERC20')
-            print(f"✓ Deposit address: {deposit_info['address']}")
-            if deposit_info.get('tag'):
-                print(f"  Tag/Memo: {deposit_info['tag']}")
-        except Exception as e:
-            print(f"✗ Error getting deposit address: {e}")
-        print()
-        
-        # Example 3: Withdraw (commented out for safety)
-        print("--- Example 3: Withdraw (Demo) ---")
-        print("Withdraw function is available but commented out for safety.")
-        print("Example usage:")
-        print("""
-        result = manager.withdraw(
-            coin='USDT',
-            amount=10.0,
-            address='0x742d35Cc6634C0532925a3b844Bc9e7595f0bEb',
-            network='ERC20'
-        )
-        print(f"✓ Withdrawal successful! TX ID: {result['transaction_id']}")
-        """)
-        print()
-        
-        # Example 4: Get Deposit History
-        print("--- Example 4: Get Deposit History ---")
-        print("Fetching recent deposits...")
-        try:
-            deposits = manager.get_deposit_history(limit=5)
-            print(f"✓ Found {len(deposits)} recent deposits")
-            for i, deposit in enumerate(deposits[:3], 1):
-                print(f"  {i}. {deposit.get('currency', 'N/A')} - "
-                      f"Amount: {deposit.get('amount', 0)} - "
-                      f"Status: {deposit.get('status', 'N/A')}")
-        except Exception as e:
-            print(f"✗ Error getting deposit history: {e}")
-        print()
-        
-        # Example 5: Get Withdrawal History
-        print("--- Example 5: Get Withdrawal History ---")
-        print("Fetching recent withdrawals...")
-        try:
-            withdrawals = manager.get_withdrawal_history(limit=5)
-            print(f"✓ Found {len(withdrawals)} recent withdrawals")
-            for i, withdrawal in enumerate(withdrawals[:3], 1):
-                print(f"  {i}. {withdrawal.get('currency', 'N/A')} - "
-                      f"Amount: {withdrawal.get('amount', 0)} - "
-                      f"Status: {withdrawal.get('status', 'N/A')}")
-        except Exception as e:
-            print(f"✗ Error getting withdrawal history: {e}")
-        print()
-        
-        print("=== Demo Complete ===")
-        
+        asyncio.run(demo(config))
+    
     except ValueError as e:
         print(f"✗ Configuration Error: {e}")
     except Exception as e:
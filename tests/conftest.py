@@ -0,0 +1,244 @@
+"""
+Shared pytest fixtures for Binance Wallet Manager tests.
+"""
+
+import functools
+import os
+import pytest
+import pytest_asyncio
+from binance_wallet_manager import AsyncBinanceWalletManager, BinanceWalletManager, WalletError
+from binance_wallet_manager._env import ensure_env
+from binance_wallet_manager.config import Config
+
+
+def _has_credentials(config):
+    """Whether ``config`` holds real (non-placeholder) API credentials."""
+    return bool(
+        config.api_key
+        and config.api_secret
+        and config.api_key != 'your_api_key_here'
+    )
+
+
+def _live_skip_reason():
+    """Why tests marked ``live`` cannot run here, or None when they can."""
+    if not os.path.exists('.env'):
+        return "Requires .env file with BINANCE_API_KEY and BINANCE_API_SECRET"
+    if not _has_credentials(Config()):
+        return "Valid API credentials not found in .env file"
+    return None
+
+
+def pytest_configure(config):
+    """Register the marker for tests that talk to the real Binance API."""
+    config.addinivalue_line(
+        'markers',
+        "live: needs a .env file with valid Binance API credentials",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip ``live`` tests at collection time when credentials are missing."""
+    reason = _live_skip_reason()
+    if reason is None:
+        return
+    skip_live = pytest.mark.skip(reason=reason)
+    for item in items:
+        if 'live' in item.keywords:
+            item.add_marker(skip_live)
+
+
+def pytest_addoption(parser):
+    """Register command line options for the live tests."""
+    parser.addoption(
+        '--verify-balance',
+        action='store_true',
+        default=False,
+        help="Re-read the balance after live transfers to check the change",
+    )
+
+
+def _build_cases(coins, networks):
+    """
+    Build (coin, network) pairs from TEST_DEPOSIT_COINS/TEST_DEPOSIT_NETWORKS.
+
+    Networks are matched to coins by position. Use pipe (|) for several
+    networks per coin and "None" (or no entry) for the default network.
+    """
+    cases = []
+    for i, coin in enumerate(coins):
+        coin_networks = networks[i].split('|') if i < len(networks) else ['None']
+        for network in coin_networks:
+            network = network.strip()
+            cases.append((coin, None if network == 'None' else network))
+    return cases
+
+
+# The deposit test configuration does not change during a session, so it is
+# parsed once when conftest is imported (after .env has been loaded)
+_COINS = tuple(
+    c.strip() for c in os.getenv('TEST_DEPOSIT_COINS', 'BTC,ETH,USDT,BNB').split(','))
+_NETS = tuple(os.getenv('TEST_DEPOSIT_NETWORKS', 'None,None,ERC20|TRC20,BEP20').split(','))
+_CASES = tuple(_build_cases(_COINS, _NETS))
+_CASE_IDS = tuple(f"{coin}-{network or 'default'}" for coin, network in _CASES)
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize tests taking ``coin`` and ``network`` over the env cases."""
+    if {'coin', 'network'} <= set(metafunc.fixturenames):
+        metafunc.parametrize('coin,network', _CASES, ids=_CASE_IDS)
+
+
+@pytest.fixture(scope="session")
+def deposit_address_cases():
+    """All (coin, network) deposit address cases of this session."""
+    return _CASES
+
+
+def pytest_report_header(config):
+    """Show which Binance environment the live tests will talk to."""
+    if Config().testnet:
+        return [
+            "Binance TESTNET mode: add funds with the faucet at "
+            "https://testnet.binance.vision/ (deposit addresses and history "
+            "are unavailable)"
+        ]
+    return ["Binance PRODUCTION mode: real funds are at risk"]
+
+
+@pytest.fixture(scope="session")
+def env():
+    """
+    Make sure the .env file is loaded once per test session.
+
+    pytest-dotenv normally loads it at startup (see ``env_files`` in
+    pyproject.toml), in which case this is a no-op.
+    """
+    ensure_env()
+
+
+@pytest.fixture(scope="session")
+def config(env):
+    """Config read from the environment once per test session."""
+    return Config()
+
+
+@pytest.fixture(scope="session")
+def credentials_ok(config):
+    """Whether real API credentials are configured."""
+    return _has_credentials(config)
+
+
+@pytest.fixture(scope="session")
+def require_creds(credentials_ok):
+    """
+    Skip the requesting test unless real API credentials are configured.
+
+    Backstop for the manager fixtures; tests themselves are marked
+    ``live`` and are skipped at collection time before reaching it.
+    """
+    if not credentials_ok:
+        pytest.skip("Valid API credentials not found in .env file")
+
+
+@pytest.fixture(scope="session")
+def manager(config, require_creds):
+    """
+    Wallet manager shared by all live tests, built once per session.
+
+    Markets are loaded here (from the on-disk cache when it is fresh), so
+    no test pays for the download on its first request.
+    """
+    manager = BinanceWalletManager.get_shared(config)
+    manager.exchange.options['warnOnFetchOpenOrdersWithoutSymbol'] = False
+    # Fail fast on an unreachable endpoint instead of ccxt's 10s default
+    manager.exchange.timeout = 5000
+    return manager
+
+
+@pytest_asyncio.fixture
+async def async_manager(config, require_creds):
+    """Asyncio wallet manager for live tests, closed after each test."""
+    async with AsyncBinanceWalletManager(config) as manager:
+        manager.exchange.timeout = 5000
+        await manager.load_markets()
+        yield manager
+
+
+@pytest.fixture(scope="session")
+def require_mainnet(config):
+    """Skip the requesting test in testnet mode, which lacks SAPI endpoints."""
+    if config.testnet:
+        pytest.skip("SAPI endpoints unavailable in testnet")
+
+
+@pytest.fixture(scope="session")
+def mainnet_manager(require_mainnet, manager):
+    """Shared manager for tests of SAPI endpoints, which testnet lacks."""
+    return manager
+
+
+@pytest_asyncio.fixture
+async def async_mainnet_manager(require_mainnet, async_manager):
+    """Asyncio manager for SAPI tests; skipped before it is built on testnet."""
+    return async_manager
+
+
+@pytest.fixture(scope="session")
+def initial_balance(manager, request):
+    """
+    Pre-transfer balance of the coin given by indirect parametrization.
+
+    Fetched once per coin and session, so transfer tests share one snapshot.
+    """
+    try:
+        return manager.get_balance(request.param)
+    except WalletError as e:
+        pytest.skip(f"Cannot verify balance: {e.__cause__ or e}")
+
+
+@pytest.fixture(scope="session")
+def fake_config():
+    """Offline testnet config with dummy credentials, independent of .env."""
+    return Config(api_key='test_key', api_secret='test_secret', testnet=True)
+
+
+@pytest.fixture(scope="session")
+def manager_fake(fake_config):
+    """Offline wallet manager built once from dummy credentials."""
+    return BinanceWalletManager(fake_config)
+
+
+@pytest.fixture
+def offline_manager(fake_config):
+    """Offline wallet manager built per test, so tests can patch its exchange."""
+    return BinanceWalletManager(fake_config)
+
+
+@pytest.fixture(scope="session")
+def cached_get_address(mainnet_manager):
+    """
+    Memoized ``get_deposit_address`` shared across the session.
+
+    Deposit addresses are fixed per (coin, network). Both arguments must be
+    passed positionally so every caller shares one cache key. Entries written
+    by the deposit address prefetch are reused by the async consistency
+    check when its coin is prefetched with the default network, which is the
+    case for BTC with the default settings outside pytest-xdist.
+    """
+    # ``network`` is required so f(coin) and f(coin, None) cannot be cached
+    # under different keys
+    @functools.lru_cache(maxsize=None)
+    def get_address(coin, network):
+        return mainnet_manager.get_deposit_address(coin=coin, network=network)
+
+    yield get_address
+    get_address.cache_clear()
+
+
+@pytest.fixture
+def config_with_creds(monkeypatch):
+    """Config built from dummy credentials set for the current test only."""
+    monkeypatch.setenv('BINANCE_API_KEY', 'test_key')
+    monkeypatch.setenv('BINANCE_API_SECRET', 'test_secret')
+    return Config()
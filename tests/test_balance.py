@@ -2,39 +2,25 @@
 Tests for Binance Wallet Manager balance operations.
 """
 
-import os
+import asyncio
+import heapq
+import logging
+import threading
+import time
 import pytest
-from binance_wallet_manager import BinanceWalletManager
+from binance_wallet_manager import AsyncBinanceWalletManager, BinanceWalletManager
 from binance_wallet_manager.config import Config
 
 
-@pytest.mark.skipif(
-    not os.path.exists('.env'),
-    reason="Requires .env file with BINANCE_API_KEY and BINANCE_API_SECRET"
-)
-def test_get_real_balance_from_env():
-    """Test fetching real balance from Binance testnet using .env credentials."""
-    from dotenv import load_dotenv
-
-    # Load config from .env file
-    load_dotenv()
-
-    # Check if credentials are loaded
-    api_key = os.getenv('BINANCE_API_KEY')
-    api_secret = os.getenv('BINANCE_API_SECRET')
-
-    if not api_key or not api_secret or api_key == 'your_api_key_here':
-        pytest.skip("Valid API credentials not found in .env file")
+logger = logging.getLogger(__name__)
 
-    # Load config from environment variables
-    config = Config()
 
+@pytest.mark.live
+def test_get_real_balance_from_env(config, manager):
+    """Test fetching real balance from Binance testnet using .env credentials."""
     # Ensure we're in testnet mode
     assert config.testnet is True, "Test should run in testnet mode"
 
-    # Initialize wallet manager
-    manager = BinanceWalletManager(config)
-
     # Fetch balance for all coins
     balance = manager.get_balance()
 
@@ -45,43 +31,35 @@ def test_get_real_balance_from_env():
     assert 'used' in balance
     assert 'total' in balance
 
-    # Print structured balance output
-    print("\n" + "=" * 80)
-    print("BINANCE TESTNET BALANCE REPORT")
-    print("=" * 80)
-
-    # Get coins with non-zero balances
-    coins_with_balance = {
-        coin: {
-            'free': balance['free'].get(coin, 0),
-            'used': balance['used'].get(coin, 0),
-            'total': balance['total'].get(coin, 0)
-        }
-        for coin in balance['total']
-        if balance['total'].get(coin, 0) > 0
-    }
-
-    print(f"\nTotal Coins with Balance: {len(coins_with_balance)}")
-    print("\n" + "-" * 80)
-    print(f"{'COIN':<15} {'FREE':<20} {'USED':<20} {'TOTAL':<20}")
-    print("-" * 80)
-
-    # Sort by total balance descending
-    sorted_coins = sorted(
-        coins_with_balance.items(),
-        key=lambda x: x[1]['total'],
-        reverse=True
+    # Get coins with non-zero balances in a single pass over the totals
+    totals = balance['total']
+    frees = balance['free']
+    useds = balance['used']
+    nonzero = [(coin, total) for coin, total in totals.items() if total and total > 0]
+
+    # Select the top 20 coins by total balance without sorting them all
+    top_coins = heapq.nlargest(20, nonzero, key=lambda item: item[1])
+
+    # Build the structured balance report, formatting only the displayed rows
+    lines = [
+        "",
+        "=" * 80,
+        "BINANCE TESTNET BALANCE REPORT",
+        "=" * 80,
+        f"\nTotal Coins with Balance: {len(nonzero)}",
+        "\n" + "-" * 80,
+        f"{'COIN':<15} {'FREE':<20} {'USED':<20} {'TOTAL':<20}",
+        "-" * 80,
+    ]
+    lines.extend(
+        f"{coin:<15} {frees.get(coin, 0):<20.8f} {useds.get(coin, 0):<20.8f} {total:<20.8f}"
+        for coin, total in top_coins
     )
+    if len(nonzero) > 20:
+        lines.append(f"\n... and {len(nonzero) - 20} more coins with balance")
+    lines.append("-" * 80)
 
-    # Display top 20 coins by balance
-    for coin, amounts in sorted_coins[:20]:
-        print(
-            f"{coin:<15} {amounts['free']:<20.8f} {amounts['used']:<20.8f} {amounts['total']:<20.8f}")
-
-    if len(sorted_coins) > 20:
-        print(f"\n... and {len(sorted_coins) - 20} more coins with balance")
-
-    print("-" * 80)
+    logger.info("\n".join(lines))
 
     # Test fetching balance for a specific coin (e.g., BNB)
     bnb_balance = manager.get_balance('BNB')
@@ -92,11 +70,141 @@ def test_get_real_balance_from_env():
     assert 'used' in bnb_balance['BNB']
     assert 'total' in bnb_balance['BNB']
 
-    print("\n" + "=" * 80)
-    print("SPECIFIC COIN QUERY TEST (BNB)")
-    print("=" * 80)
-    print(f"\nCoin: BNB")
-    print(f"  Free:  {bnb_balance['BNB']['free']:.8f}")
-    print(f"  Used:  {bnb_balance['BNB']['used']:.8f}")
-    print(f"  Total: {bnb_balance['BNB']['total']:.8f}")
-    print("\n" + "=" * 80)
+    bnb = bnb_balance['BNB']
+    logger.info(
+        "\n".join([
+            "",
+            "=" * 80,
+            "SPECIFIC COIN QUERY TEST (BNB)",
+            "=" * 80,
+            "\nCoin: BNB",
+            f"  Free:  {bnb['free']:.8f}",
+            f"  Used:  {bnb['used']:.8f}",
+            f"  Total: {bnb['total']:.8f}",
+            "\n" + "=" * 80,
+        ])
+    )
+
+
+def _make_manager(monkeypatch, ttl=60.0, respond=None):
+    """
+    Build a manager with dummy credentials and a counting fetch_balance.
+
+    ``respond`` optionally produces the balance instead of the fixed one.
+    """
+    config = Config(api_key='test_key', api_secret='test_secret', balance_ttl=ttl)
+    manager = BinanceWalletManager(config)
+    calls = []
+
+    def fake_fetch_balance(params=None):
+        calls.append(params or {})
+        if respond is not None:
+            return respond()
+        return {
+            'free': {'BNB': 1.0, 'BTC': 0.5},
+            'used': {'BNB': 0.0, 'BTC': 0.0},
+            'total': {'BNB': 1.0, 'BTC': 0.5},
+        }
+
+    monkeypatch.setattr(manager.exchange, 'fetch_balance', fake_fetch_balance)
+    return manager, calls
+
+
+def test_get_balance_reuses_cached_response(monkeypatch):
+    """Test that a coin query right after a full query is served from cache."""
+    manager, calls = _make_manager(monkeypatch)
+
+    balance = manager.get_balance()
+    bnb_balance = manager.get_balance('BNB')
+
+    assert len(calls) == 1
+    assert bnb_balance == {'BNB': {'free': 1.0, 'used': 0.0, 'total': 1.0}}
+    assert balance['total']['BTC'] == 0.5
+
+
+def test_get_balance_returns_copy_of_cached_response(monkeypatch):
+    """Test that modifying a returned balance does not alter the cache."""
+    manager, calls = _make_manager(monkeypatch)
+
+    manager.get_balance()['total']['BTC'] = 0
+
+    assert manager.get_balance()['total']['BTC'] == 0.5
+    assert len(calls) == 1
+
+
+def test_get_balance_coin_fetches_nonzero_only(monkeypatch):
+    """Test that a coin query without a cached balance omits zero balances."""
+    manager, calls = _make_manager(monkeypatch)
+
+    manager.get_balance('BNB')
+    manager.get_balance('BTC')
+    assert calls == [{'omitZeroBalances': True}]
+
+    # A full query cannot be answered from the trimmed snapshot
+    manager.get_balance()
+    assert calls == [{'omitZeroBalances': True}, {}]
+
+
+def test_get_balance_cache_disabled_with_zero_ttl(monkeypatch):
+    """Test that BINANCE_BALANCE_TTL=0 fetches on every call."""
+    manager, calls = _make_manager(monkeypatch, ttl=0)
+
+    manager.get_balance()
+    manager.get_balance('BNB')
+
+    assert len(calls) == 2
+
+
+def test_concurrent_coin_queries_share_one_fetch(monkeypatch):
+    """Test that concurrent per-coin queries coalesce into one request."""
+    release = threading.Event()
+
+    def slow_balance():
+        release.wait(5)
+        return {'free': {'BTC': 1.0, 'ETH': 2.0}, 'used': {}, 'total': {'BTC': 1.0, 'ETH': 2.0}}
+
+    # Disable caching so only in-flight coalescing can avoid extra calls
+    manager, calls = _make_manager(monkeypatch, ttl=0, respond=slow_balance)
+
+    results = {}
+
+    def query(coin):
+        results[coin] = manager.get_balance(coin)[coin]['total']
+
+    threads = [threading.Thread(target=query, args=(coin,)) for coin in ('BTC', 'ETH', 'BTC')]
+    threads[0].start()
+    while not calls:
+        time.sleep(0.01)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == {'BTC': 1.0, 'ETH': 2.0}
+
+
+def test_async_get_balance_reuses_cached_response(monkeypatch):
+    """Test that concurrent async balance queries share one fetch."""
+    config = Config(api_key='test_key', api_secret='test_secret', balance_ttl=60)
+    calls = []
+
+    async def fake_fetch_balance(*args, **kwargs):
+        calls.append(1)
+        return {'free': {'BNB': 1.0}, 'used': {'BNB': 0.0}, 'total': {'BNB': 1.0}}
+
+    async def run():
+        async with AsyncBinanceWalletManager(config) as manager:
+            monkeypatch.setattr(manager.exchange, 'fetch_balance', fake_fetch_balance)
+            return await asyncio.gather(
+                manager.get_balance(),
+                manager.get_balance('BNB'),
+            )
+
+    balance, bnb_balance = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert bnb_balance['BNB']['total'] == 1.0
+    assert balance['total'] == {'BNB': 1.0}
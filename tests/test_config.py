@@ -2,9 +2,9 @@
 Basic tests for Binance Wallet Manager configuration.
 """
 
-import os
+import dataclasses
 import pytest
-from binance_wallet_manager.config import Config
+from binance_wallet_manager.config import Config, get_config
 
 
 def test_config_initialization():
@@ -15,66 +15,109 @@ def test_config_initialization():
     assert isinstance(config.sandbox_mode, bool)
 
 
-def test_config_validation_without_credentials():
+def test_config_validation_without_credentials(monkeypatch):
     """Test that Config validation fails without credentials."""
-    # Clear environment variables
-    old_key = os.environ.pop('BINANCE_API_KEY', None)
-    old_secret = os.environ.pop('BINANCE_API_SECRET', None)
-    
-    try:
-        config = Config()
-        assert not config.validate()
-    finally:
-        # Restore environment variables if they existed
-        if old_key:
-            os.environ['BINANCE_API_KEY'] = old_key
-        if old_secret:
-            os.environ['BINANCE_API_SECRET'] = old_secret
+    monkeypatch.delenv('BINANCE_API_KEY', raising=False)
+    monkeypatch.delenv('BINANCE_API_SECRET', raising=False)
+
+    config = Config()
+    assert not config.validate()
 
 
-def test_config_validation_with_credentials():
+def test_config_validation_with_credentials(config_with_creds):
     """Test that Config validation passes with credentials."""
-    # Set test environment variables
-    os.environ['BINANCE_API_KEY'] = 'test_key'
-    os.environ['BINANCE_API_SECRET'] = 'test_secret'
-    
-    try:
-        config = Config()
-        assert config.validate()
-        assert config.api_key == 'test_key'
-        assert config.api_secret == 'test_secret'
-    finally:
-        # Clean up
-        os.environ.pop('BINANCE_API_KEY', None)
-        os.environ.pop('BINANCE_API_SECRET', None)
+    assert config_with_creds.validate()
+    assert config_with_creds.api_key == 'test_key'
+    assert config_with_creds.api_secret == 'test_secret'
 
 
-def test_config_get_api_credentials():
+def test_config_get_api_credentials(config_with_creds):
     """Test that get_api_credentials returns correct format."""
-    os.environ['BINANCE_API_KEY'] = 'test_key'
-    os.environ['BINANCE_API_SECRET'] = 'test_secret'
-    
-    try:
-        config = Config()
-        credentials = config.get_api_credentials()
-        assert isinstance(credentials, dict)
-        assert 'apiKey' in credentials
-        assert 'secret' in credentials
-        assert credentials['apiKey'] == 'test_key'
-        assert credentials['secret'] == 'test_secret'
-    finally:
-        os.environ.pop('BINANCE_API_KEY', None)
-        os.environ.pop('BINANCE_API_SECRET', None)
+    credentials = config_with_creds.get_api_credentials()
+    assert isinstance(credentials, dict)
+    assert 'apiKey' in credentials
+    assert 'secret' in credentials
+    assert credentials['apiKey'] == 'test_key'
+    assert credentials['secret'] == 'test_secret'
 
 
-def test_config_testnet_flag():
+def test_config_api_credentials_is_shared_and_read_only():
+    """Test that api_credentials is built once and cannot be mutated."""
+    config = Config(api_key='test_key', api_secret='test_secret')
+
+    assert config.api_credentials is config.api_credentials
+    assert dict(config.api_credentials) == {'apiKey': 'test_key', 'secret': 'test_secret'}
+    with pytest.raises(TypeError):
+        config.api_credentials['apiKey'] = 'other_key'
+
+
+def test_config_testnet_flag(monkeypatch):
     """Test that testnet flag is properly read."""
-    os.environ['BINANCE_TESTNET'] = 'true'
+    monkeypatch.setenv('BINANCE_TESTNET', 'true')
     config = Config()
     assert config.testnet is True
-    
-    os.environ['BINANCE_TESTNET'] = 'false'
+
+    monkeypatch.setenv('BINANCE_TESTNET', 'false')
     config = Config()
     assert config.testnet is False
-    
-    os.environ.pop('BINANCE_TESTNET', None)
+
+
+def test_config_is_immutable():
+    """Test that Config fields cannot be reassigned."""
+    config = Config(api_key='test_key', api_secret='test_secret')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.api_key = 'other_key'
+
+
+def test_config_uses_slots():
+    """Test that Config stores its fields in slots, without a __dict__."""
+    config = Config(api_key='test_key', api_secret='test_secret')
+    assert set(Config.__slots__) >= {'api_key', 'api_secret', 'testnet', 'sandbox_mode'}
+    assert not hasattr(config, '__dict__')
+
+
+def test_config_repr_hides_credentials():
+    """Test that repr() never shows the API key or secret."""
+    config = Config(api_key='AK', api_secret='SUPERSECRET')
+    text = repr(config)
+    assert 'SUPERSECRET' not in text
+    assert 'AK' not in text
+    assert 'testnet=' in text
+
+
+def test_get_config_is_cached():
+    """Test that get_config parses the environment only once."""
+    get_config.cache_clear()
+    try:
+        assert get_config() is get_config()
+    finally:
+        get_config.cache_clear()
+
+
+def test_ensure_env_loads_dotenv_once(monkeypatch):
+    """Test that ensure_env parses the .env file at most once."""
+    from binance_wallet_manager import _env
+
+    calls = []
+    monkeypatch.setattr(_env, '_LOADED', False)
+    monkeypatch.setattr(_env, 'load_dotenv', lambda **kwargs: calls.append(kwargs))
+    monkeypatch.delenv('BINANCE_API_KEY', raising=False)
+
+    _env.ensure_env()
+    _env.ensure_env()
+
+    assert calls == [{'override': False}]
+
+
+def test_ensure_env_loads_dotenv_with_exported_key(monkeypatch):
+    """Test that an exported API key does not stop the rest of .env loading."""
+    from binance_wallet_manager import _env
+
+    calls = []
+    monkeypatch.setattr(_env, '_LOADED', False)
+    monkeypatch.setattr(_env, 'load_dotenv', lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setenv('BINANCE_API_KEY', 'exported_key')
+
+    _env.ensure_env()
+
+    assert calls == [{'override': False}]
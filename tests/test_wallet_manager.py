@@ -2,69 +2,255 @@
 Basic tests for Binance Wallet Manager.
 """
 
-import os
+import asyncio
+import http.server
+import json
+import threading
+from dataclasses import replace
+import ccxt
 import pytest
-from binance_wallet_manager import BinanceWalletManager
-from binance_wallet_manager.config import Config
+from binance_wallet_manager import (
+    AsyncBinanceWalletManager, BinanceWalletManager, WalletError, WalletNetworkError,
+)
+from binance_wallet_manager.config import get_config
 
 
-def test_wallet_manager_initialization_without_config():
+def test_wallet_manager_initialization_without_config(monkeypatch):
     """Test that WalletManager raises error without valid config."""
-    # Clear environment variables
-    old_key = os.environ.pop('BINANCE_API_KEY', None)
-    old_secret = os.environ.pop('BINANCE_API_SECRET', None)
+    # Clear environment variables for this test only
+    monkeypatch.delenv('BINANCE_API_KEY', raising=False)
+    monkeypatch.delenv('BINANCE_API_SECRET', raising=False)
+    get_config.cache_clear()
 
     try:
         with pytest.raises(ValueError, match="Invalid configuration"):
             manager = BinanceWalletManager()
     finally:
-        # Restore environment variables if they existed
-        if old_key:
-            os.environ['BINANCE_API_KEY'] = old_key
-        if old_secret:
-            os.environ['BINANCE_API_SECRET'] = old_secret
+        get_config.cache_clear()
 
 
-def test_wallet_manager_initialization_with_config():
+def test_wallet_manager_initialization_with_config(config_with_creds):
     """Test that WalletManager initializes with valid config."""
-    # Set test environment variables
-    os.environ['BINANCE_API_KEY'] = 'test_key'
-    os.environ['BINANCE_API_SECRET'] = 'test_secret'
+    manager = BinanceWalletManager(config_with_creds)
+    assert manager is not None
+    assert manager.exchange is not None
+    assert manager.config == config_with_creds
 
-    try:
-        config = Config()
-        manager = BinanceWalletManager(config)
-        assert manager is not None
-        assert manager.exchange is not None
-        assert manager.config == config
-    finally:
-        # Clean up
-        os.environ.pop('BINANCE_API_KEY', None)
-        os.environ.pop('BINANCE_API_SECRET', None)
 
+@pytest.mark.parametrize("method", [
+    'get_balance',
+    'withdraw',
+    'get_deposit_address',
+    'get_deposit_history',
+    'get_withdrawal_history',
+])
+def test_wallet_manager_method_exists(manager_fake, method):
+    """Test that each expected method exists on WalletManager."""
+    assert callable(getattr(manager_fake, method, None))
+
+
+def test_get_shared_returns_single_instance(monkeypatch, fake_config):
+    """Test that get_shared builds one manager per set of credentials."""
+    monkeypatch.setattr(BinanceWalletManager, '_instances', {})
+
+    loads = []
+    monkeypatch.setattr(
+        BinanceWalletManager, 'load_markets',
+        lambda self, reload=False: loads.append(self) or {}
+    )
+
+    manager = BinanceWalletManager.get_shared(fake_config)
+    assert BinanceWalletManager.get_shared(replace(fake_config)) is manager
+    assert loads == [manager]
+
+    other = replace(fake_config, api_key='other_key')
+    assert BinanceWalletManager.get_shared(other) is not manager
 
-def test_wallet_manager_methods_exist():
-    """Test that all expected methods exist on WalletManager."""
-    os.environ['BINANCE_API_KEY'] = 'test_key'
-    os.environ['BINANCE_API_SECRET'] = 'test_secret'
 
+def test_wallet_manager_uses_pooled_session(manager_fake):
+    """Test that the exchange reuses a keep-alive session with pooling."""
+    session = manager_fake.exchange.session
+
+    assert session.headers['Connection'] == 'keep-alive'
+    assert session.get_adapter('https://api.binance.com')._pool_maxsize == 40
+    assert session.trust_env is False
+
+
+def test_rate_limit_response_is_not_retried(offline_manager):
+    """Test that a 429 reaches CCXT once and surfaces as WalletNetworkError."""
+    hits = []
+
+    class RateLimitedHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            body = json.dumps({'code': -1003, 'msg': 'Too many requests.'}).encode()
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.HTTPServer(('127.0.0.1', 0), RateLimitedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
     try:
-        config = Config()
-        manager = BinanceWalletManager(config)
-
-        # Check that all expected methods exist
-        assert hasattr(manager, 'get_balance')
-        assert hasattr(manager, 'withdraw')
-        assert hasattr(manager, 'get_deposit_address')
-        assert hasattr(manager, 'get_deposit_history')
-        assert hasattr(manager, 'get_withdrawal_history')
-
-        # Check that methods are callable
-        assert callable(manager.get_balance)
-        assert callable(manager.withdraw)
-        assert callable(manager.get_deposit_address)
-        assert callable(manager.get_deposit_history)
-        assert callable(manager.get_withdrawal_history)
+        base = f'http://127.0.0.1:{server.server_port}/api/v3'
+        offline_manager.exchange.urls['api']['private'] = base
+        offline_manager.exchange.urls['api']['public'] = base
+
+        with pytest.raises(WalletNetworkError) as excinfo:
+            offline_manager.get_balance()
     finally:
-        os.environ.pop('BINANCE_API_KEY', None)
-        os.environ.pop('BINANCE_API_SECRET', None)
+        server.shutdown()
+        server.server_close()
+
+    assert isinstance(excinfo.value.__cause__, ccxt.DDoSProtection)
+    assert len(hits) == 1
+
+
+def test_wallet_manager_uses_testnet_urls(manager_fake):
+    """Test that testnet mode routes requests to the sandbox only."""
+    urls = manager_fake.exchange.urls['api']
+
+    assert urls['public'].startswith('https://testnet.binance.vision')
+    # SAPI (wallet) endpoints have no testnet URL and must not fall back to production
+    assert 'sapi' not in urls
+
+
+def test_withdraw_builds_exchange_params(monkeypatch, offline_manager):
+    """Test that withdraw forwards network, tag and extra params."""
+    captured = {}
+
+    def fake_withdraw(code, amount, address, tag=None, params=None):
+        captured.update(params)
+        return {'id': 'tx123'}
+
+    monkeypatch.setattr(offline_manager.exchange, 'withdraw', fake_withdraw)
+
+    result = offline_manager.withdraw(
+        coin='XRP', amount=1.0, address='rAddress', network='XRP',
+        tag='42', walletType=1
+    )
+
+    assert captured == {'network': 'XRP', 'tag': '42', 'walletType': 1}
+    assert result['transaction_id'] == 'tx123'
+    assert result['success'] is True
+
+
+@pytest.mark.parametrize("error, expected", [
+    (ccxt.RequestTimeout("timed out"), WalletNetworkError),
+    (ccxt.InsufficientFunds("not enough"), WalletError),
+])
+def test_exchange_errors_are_chained(monkeypatch, offline_manager, error, expected):
+    """Test that CCXT errors become wallet errors with the cause attached."""
+    def failing_fetch_deposits(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(offline_manager.exchange, 'fetch_deposits', failing_fetch_deposits)
+
+    with pytest.raises(expected) as excinfo:
+        offline_manager.get_deposit_history()
+    assert type(excinfo.value) is expected
+    assert excinfo.value.__cause__ is error
+
+
+@pytest.mark.parametrize("error, expected", [
+    (ccxt.RequestTimeout("timed out"), WalletError),
+    (ccxt.DDoSProtection("rate limited"), WalletNetworkError),
+])
+def test_withdraw_timeout_is_not_retryable(monkeypatch, offline_manager, error, expected):
+    """Test that a timed-out withdrawal is not reported as safe to retry."""
+    fetches = []
+
+    def fake_fetch_balance(params=None):
+        fetches.append(params)
+        return {'free': {}, 'used': {}, 'total': {}}
+
+    def failing_withdraw(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(offline_manager.exchange, 'fetch_balance', fake_fetch_balance)
+    monkeypatch.setattr(offline_manager.exchange, 'withdraw', failing_withdraw)
+    offline_manager.get_balance()
+
+    with pytest.raises(WalletError) as excinfo:
+        offline_manager.withdraw(coin='USDT', amount=1.0, address='0xabc')
+    assert type(excinfo.value) is expected
+    assert excinfo.value.__cause__ is error
+
+    # The withdrawal may have gone through, so the balance is re-read
+    offline_manager.get_balance()
+    assert len(fetches) == 2
+
+
+def test_unexpected_errors_propagate_unwrapped(monkeypatch, offline_manager):
+    """Test that programming errors are not hidden behind WalletError."""
+    def broken_fetch_deposits(*args, **kwargs):
+        raise KeyError('oops')
+
+    monkeypatch.setattr(offline_manager.exchange, 'fetch_deposits', broken_fetch_deposits)
+
+    with pytest.raises(KeyError):
+        offline_manager.get_deposit_history()
+
+
+def test_load_markets_uses_disk_cache(monkeypatch, tmp_path, fake_config):
+    """Test that markets downloaded once are restored from disk afterwards."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    market = {
+        'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT',
+        'baseId': 'BTC', 'quoteId': 'USDT', 'type': 'spot', 'spot': True,
+    }
+    downloads = []
+
+    def fake_load_markets(exchange):
+        def load(reload=False):
+            downloads.append(1)
+            exchange.set_markets([market])
+            return exchange.markets
+        return load
+
+    first = BinanceWalletManager(fake_config)
+    monkeypatch.setattr(first.exchange, 'load_markets', fake_load_markets(first.exchange))
+    assert 'BTC/USDT' in first.load_markets()
+    assert (tmp_path / 'binance_wallet_manager' / 'markets-testnet.json').exists()
+
+    second = BinanceWalletManager(fake_config)
+    monkeypatch.setattr(second.exchange, 'load_markets', fake_load_markets(second.exchange))
+    markets = second.load_markets()
+
+    assert downloads == [1]
+    assert markets['BTC/USDT']['id'] == 'BTCUSDT'
+    assert second.exchange.markets_by_id['BTCUSDT'][0]['symbol'] == 'BTC/USDT'
+
+
+def test_async_load_markets_uses_disk_cache(monkeypatch, tmp_path, fake_config):
+    """Test that the async manager restores markets written by the sync one."""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    market = {
+        'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT',
+        'baseId': 'BTC', 'quoteId': 'USDT', 'type': 'spot', 'spot': True,
+    }
+
+    sync_manager = BinanceWalletManager(fake_config)
+
+    def load(reload=False):
+        sync_manager.exchange.set_markets([market])
+        return sync_manager.exchange.markets
+
+    monkeypatch.setattr(sync_manager.exchange, 'load_markets', load)
+    sync_manager.load_markets()
+
+    async def run():
+        async with AsyncBinanceWalletManager(fake_config) as manager:
+            async def fail(reload=False):
+                raise AssertionError("markets should come from the disk cache")
+
+            monkeypatch.setattr(manager.exchange, 'load_markets', fail)
+            return await manager.load_markets()
+
+    markets = asyncio.run(run())
+    assert markets['BTC/USDT']['id'] == 'BTCUSDT'